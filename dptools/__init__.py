@@ -4,3 +4,6 @@ __version__ = '1.1.2'
 # suppress annoying tensorflow warnings
 os.environ["KMP_WARNINGS"] = "0"
 os.environ["KMP_BLOCKTIME"] = "0"
+# don't let the first TF session (e.g. graph2typemap) grab all GPU memory, DP ensembles
+# load several models. Must be set before deepmd/tensorflow is imported to have any effect
+os.environ.setdefault("TF_FORCE_GPU_ALLOW_GROWTH", "true")
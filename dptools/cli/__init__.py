@@ -1,23 +1,44 @@
 import argparse
-import re
+import os
+import sys
 from importlib import import_module
-from textwrap import dedent, fill
 
 from dptools import __version__
 
-commands = (
-    "input",
-    "train",
-    "parity",
-    "run",
-    "sample",
-    "convert",
-    "set",
-    "get",
-    "reset",
-    "info",
-    "shake",
-)
+# command name -> module containing its CLI class
+command_table = {
+    "input": "dptools.cli.input",
+    "train": "dptools.cli.train",
+    "parity": "dptools.cli.parity",
+    "run": "dptools.cli.run",
+    "sample": "dptools.cli.sample",
+    "convert": "dptools.cli.convert",
+    "set": "dptools.cli.set",
+    "get": "dptools.cli.get",
+    "reset": "dptools.cli.reset",
+    "info": "dptools.cli.info",
+    "shake": "dptools.cli.shake",
+}
+commands = tuple(command_table)
+
+# short help for each command, kept here so the top-level command listing
+# doesn't need to import every command module (and everything they import)
+help_info = {
+    "input": "Set up deepmd-kit training input from ASE/VASP output",
+    "train": "Setup and submit jobs to train deepmd-kit models",
+    "parity": "Generate energy and force (and stress if available) prediction "\
+            "parity plots for DP model",
+    "run": "Run simulation using trained DP model "\
+            "(USE COMMAND 'dptools set path/to/graph.pb' first)",
+    "sample": "Select new training configs from MD traj "\
+            "using force prediction deviations from ensemble of DPs",
+    "convert": "Convert between structure file types (e.g., .xml to .db)",
+    "set": "Set DP model defaults, calculation parameters, or sbatch settings",
+    "get": "Get params.yaml for specific simulation type",
+    "reset": "Reset model or sbatch params for default or labeled dptools env",
+    "info": "Show loaded DP models and sbatch parameters",
+    "shake": "Shake atoms to generate unique starting points for multiple MD runs",
+}
 
 class BaseCLI:
     """
@@ -46,30 +67,84 @@ class MyFormatter(argparse.ArgumentDefaultsHelpFormatter):
     to print to console. Also dedents and retains docstring format.
     """
 
+    _PATTERN = None  # compiled on first help render, see _get_pattern()
+    _URL = "https://dptools.rtfd.io/en/latest/"
+
+    @classmethod
+    def _get_pattern(cls):
+        """Compile regex pattern once (only needed when rendering help)."""
+        if cls._PATTERN is None:
+            import re
+            cls._PATTERN = re.compile(
+                    r":[a-z]+:`(?P<text>[\w ]+)<\.\./(?P<link>[\w/]+)>`"  # e.g. :doc:`text<ref_path>`
+                    r"|[ ]*[.]{2} [\w-]+::[\w ]*\n\n"                     # e.g. .. command:: text
+                    )
+        return cls._PATTERN
+
+    @classmethod
+    def _replace(cls, match):
+        if match.group("text") is None: # directive, remove completely
+            return ""
+        return f"{match.group('text')}: {cls._URL}{match.group('link')}.html"
+
     def _fill_text(self, text, width, indent):
-        # replaces e.g. :doc:`text<ref_path>`
-        pattern = r":[a-z]+:`[\w ]+<[.\w/]+>`"
-        subpattern_link = r"<../[a-z/]+>"
-        subpattern_text = r"`[\w ]+<"
+        # only needed when rendering help, so don't import on every call to dptools
+        from textwrap import dedent
+        text = self._get_pattern().sub(self._replace, text)
+        return dedent(text)
 
-        url = ": https://dptools.rtfd.io/en/latest/"
 
-        matches = re.findall(pattern, text)
-        for match in matches:
-            keep = re.search(subpattern_text, match).group()[1:-1]
-            sub = re.search(subpattern_link, match).group()[4:-1]
-            new = f"{keep}{url}{sub}.html"
-            text = text.replace(match, new)
+def get_input_paths(inputs):
+    """
+    Get absolute paths to input files (e.g. structures to run simulations on) and
+    the corresponding directories to write results to. Used by commands that run
+    something separately for each input file.
 
-        # replaces e.g. .. command:: text
-        pattern = r"[ ]*[.]{2} [\w-]+::[\w ]*\n\n"
-        while re.search(pattern, text):
-            text = re.sub(pattern, "", text)
+    Args:
+        inputs (list[str]): Paths to input files.
 
-        return dedent(text)
+    Returns:
+        tuple[list[str], list[str]]: Absolute paths to inputs and directories to use
+            for each input ('.' if only one input is given).
+    """
+    cwd = os.getcwd() # abspath calls getcwd for every input
+    paths = [os.path.normpath(os.path.join(cwd, i)) for i in inputs]
+    if len(paths) == 1:
+        return paths, ["."]
+
+    # NOTE: dict used as ordered set, set() is shadowed by dptools.cli.set once imported
+    dirs = {}
+    for p in paths:
+        d = os.path.dirname(p)
+        if d in dirs: # stop at first duplicate
+            # FIXME: Results are overwritten if multiple structure inputs are in the same dir
+            raise Exception("Can't resolve inputs, harass me to fix this")
+        dirs[d] = None
+    return paths, list(dirs)
+
+
+def get_command(argv):
+    """
+    Find which command is being called without parsing all args, i.e. the first
+    positional arg (dptools itself has no options that take values).
+
+    Args:
+        argv (list[str]): Command line args, generally sys.argv[1:].
+
+    Returns:
+        str or None: Name of called command, None if no (known) command is found.
+    """
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg if arg in command_table else None
+    return None
 
 
 def main():
+    if sys.argv[1:] == ["--version"]: # no need to build any parsers for this
+        print(__version__)
+        return
+
     parser = argparse.ArgumentParser(prog="dptools",
                                      description="DPTools CLI for doing stuff with deepmd-kit\n\n"\
                                              "Complete documentation available at: "\
@@ -79,16 +154,21 @@ def main():
     parser.add_argument("--version", action="version", version=__version__)
     subparsers = parser.add_subparsers(title="commands", dest="command")
     # TODO: Add logging
-    command_clis = {}
-    for comm in commands:
-        mod = "dptools.cli." + comm
-        CLI = import_module(mod).CLI
-        doc = CLI.__doc__
-        subparser = subparsers.add_parser(comm, help=CLI.help_info, description=doc,
-                formatter_class=MyFormatter)
-        cli = CLI(subparser)
-        cli.add_args()
-        command_clis[comm] = cli
+    # only import and set up args for the command that is actually called,
+    # otherwise just list the commands with a stub subparser for each
+    command = get_command(sys.argv[1:])
+    if command is None:
+        for comm in commands:
+            subparsers.add_parser(comm, help=help_info[comm])
+        parser.parse_args() # handles --help, --version, and invalid commands
+        parser.print_help()
+        return
 
+    CLI = import_module(command_table[command]).CLI
+    # help=... is only shown in the command listing, which isn't rendered here
+    subparser = subparsers.add_parser(command, description=CLI.__doc__,
+            formatter_class=MyFormatter)
+    cli = CLI(subparser)
+    cli.add_args()
     parsed_args = parser.parse_args()
-    command_clis[parsed_args.command].main(parsed_args)
+    cli.main(parsed_args)
@@ -1,5 +1,4 @@
 from dptools.cli import BaseCLI
-from dptools.utils import Converter
 
 class CLI(BaseCLI):
     """
@@ -36,7 +35,10 @@ class CLI(BaseCLI):
                 help="Repeat each input before writing to output (e.g., 222)")
 
     def main(self, args):
-        converter = Converter(args.inputs, args.output[0], args.indices)
+        from ase.io.formats import string2index
+        from dptools.utils import Converter
+        indices = string2index(args.indices) # parse once, not for every input file
+        converter = Converter(args.inputs, args.output[0], indices)
         self.get_kwargs(args.inputs)
         converter.read(**self.kwargs)
         if args.repeat:
@@ -1,9 +1,11 @@
 import os
-import shutil
 
 from dptools.cli import BaseCLI
 from dptools.simulate.parameters import get_parameter_sets, write_yaml
 
+in_json_file = os.path.abspath(os.path.join(os.path.dirname(__file__), "../train/in.json"))
+
+
 class CLI(BaseCLI):
     """
     Get params.yaml for specific simulation type. Can also be used to get
@@ -33,9 +35,8 @@ class CLI(BaseCLI):
 
     def main(self, args):
         if args.simulation.endswith(".json"):
-            here = os.path.dirname(__file__)
-            json_path = os.path.abspath(os.path.join(here, "../train/in.json"))
-            shutil.copy(json_path, ".")
+            import shutil
+            shutil.copy(in_json_file, ".")
             return
 
         param_sets = get_parameter_sets()
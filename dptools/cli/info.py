@@ -1,10 +1,8 @@
-import glob
-import re
+import os
+import sys
 from os.path import dirname, join, abspath
 
 from dptools.cli import BaseCLI
-from dptools.env import get_env, load
-from dptools.utils import str2typemap
 
 
 class CLI(BaseCLI):
@@ -36,7 +34,7 @@ class CLI(BaseCLI):
                  "SBATCH_COMMENT"
              ]
         basedir = abspath(join(dirname(__file__), ".."))
-        envs = sorted(glob.glob(f"{basedir}/.env*"))
+        envs = sorted(e.path for e in os.scandir(basedir) if e.name.startswith(".env"))
         if args.model_label is not all:
             envs = [e for e in envs if e.endswith(args.model_label)]
         self.info = {}
@@ -56,9 +54,8 @@ class CLI(BaseCLI):
         Returns:
             label (str): name of environment that is appended to .env file.
         """
-        pattern = ".env.[a-zA-Z0-9]+"
-        if re.search(pattern, env_file):
-            label = env_file.split(".")[-1]
+        if os.path.basename(env_file).startswith(".env."):
+            label = env_file.rsplit(".", 1)[-1]
         else:
             label = ""
         return label
@@ -70,6 +67,7 @@ class CLI(BaseCLI):
         Args:
             env_file (str): path to .env file to get and set info for.
         """
+        from dptools.env import get_env, load
         label = self.get_env_name(env_file)
         if label:
             load(label)
@@ -82,32 +80,38 @@ class CLI(BaseCLI):
         if not self.info:
             print("No info to display, try setting a model using:",
                     "\t dptools set /path/to/graph.pb")
+        lines = [] # write everything at once instead of printing line by line
         for env, vals in self.info.items():
-            print("-" * 64)
-            print(f"{env} env")
-            print()
-            self._print_kv(vals, "DPTOOLS_MODEL")
-            self._print_kv(vals, "DPTOOLS_MODEL2")
-            self._print_kv(vals, "DPTOOLS_MODEL3")
-            self._print_kv(vals, "DPTOOLS_MODEL4")
-            print()
-            self._print_kv(vals, "DPTOOLS_TYPE_MAP")
-            print()
-            self._print_kv(vals, "SBATCH_COMMENT", fmt="{key}:\n{val}")
-            print("-" * 64)
-            print()
+            lines += ["-" * 64, f"{env} env", ""]
+            lines += self._format_kv(vals, "DPTOOLS_MODEL")
+            lines += self._format_kv(vals, "DPTOOLS_MODEL2")
+            lines += self._format_kv(vals, "DPTOOLS_MODEL3")
+            lines += self._format_kv(vals, "DPTOOLS_MODEL4")
+            lines.append("")
+            lines += self._format_kv(vals, "DPTOOLS_TYPE_MAP")
+            lines.append("")
+            lines += self._format_kv(vals, "SBATCH_COMMENT", fmt="{key}:\n{val}")
+            lines += ["-" * 64, ""]
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
 
     @staticmethod
-    def _print_kv(thing, key, fmt="{key}={val}"):
+    def _format_kv(thing, key, fmt="{key}={val}"):
+        """
+        Format env key-value for printing.
+
+        Returns:
+            list of str: Lines to print (empty if key is not set).
+        """
         val = thing.get(key)
         if "TYPE_MAP" not in key:
-            if val:
-                print(fmt.format(key=key, val=val))
+            return [fmt.format(key=key, val=val)] if val else []
+
+        lines = ["TYPE MAP:"]
+        if val:
+            from dptools.utils import str2typemap
+            type_map = str2typemap(val)
+            lines += [f"{k}\t{v}" for k, v in type_map.items()]
         else:
-            print("TYPE MAP:")
-            if val:
-                type_map = str2typemap(val)
-                for k, v in type_map.items():
-                    print(f"{k}\t{v}")
-            else:
-                print("NO MODEL SET")
+            lines.append("NO MODEL SET")
+        return lines
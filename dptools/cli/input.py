@@ -1,7 +1,8 @@
 import os
 
 from dptools.cli import BaseCLI
-from dptools.train.input import DeepInputs
+
+valid_exts = frozenset((".db", ".traj", ".xml"))
 
 
 class CLI(BaseCLI):
@@ -31,7 +32,9 @@ class CLI(BaseCLI):
                 help="Append to dataset if system already exists in dataset directory")
 
     def main(self, args):
+        from dptools.train.input import DeepInputs
         self.names = []
+        self._seen = set()
         for inp in args.inputs:
             self.set_name(inp)
         path = os.path.abspath(args.path)
@@ -44,15 +47,15 @@ class CLI(BaseCLI):
 
     def set_name(self, input_file):
         path, ext = os.path.splitext(input_file)
-        if ext not in [".db", ".traj", ".xml"]:
+        if ext not in valid_exts:
             raise ValueError(f"Unrecognized input file type, {input_file}")
-        elif ext == ".xml" and path.split("/")[-1] == "vasprun":
-            name = path.split("/")[-2]
-        else:
-            name = path.split("/")[-1]
+        head, _, name = path.rpartition("/")
+        if ext == ".xml" and name == "vasprun":
+            name = head.rpartition("/")[2] or name
 
-        if name in self.names:
+        if name in self._seen:
             raise ValueError(f"Multiple inputs with same system name detected: {name}"\
                     ". Give each input file a unique name.")
 
         self.names.append(name)
+        self._seen.add(name)
@@ -1,8 +1,6 @@
 import os
-import json
 
 from dptools.cli import BaseCLI
-from dptools.train.parity import EvaluateDP
 
 class CLI(BaseCLI):
     """
@@ -40,6 +38,7 @@ class CLI(BaseCLI):
                 help="Create fancy density heat map for forces parity plot")
 
     def main(self, args):
+        from dptools.train.parity import EvaluateDP
         if len(args.systems) > 0:
             systems = args.systems
         else:
@@ -62,11 +61,13 @@ class CLI(BaseCLI):
             list of str: Paths to system test sets found in training json file.
         """
 
-        if "out.json" not in os.listdir() and "in.json" not in os.listdir():
+        import json
+        from dptools.utils import read_cached
+        has_in = os.path.isfile("in.json")
+        if not has_in and not os.path.isfile("out.json"):
             raise FileNotFoundError("Systems not specified and no in.json in $PWD")
-        in_file = "in.json" if "in.json" in os.listdir() else "out.json"
-        with open("in.json") as file:
-            params = json.loads(file.read())
+        in_file = "in.json" if has_in else "out.json"
+        params = read_cached(in_file, json.load)
         systems = params["training"]["training_data"]["systems"]
         test_sets = [os.path.join(s, "../test/set.000") for s in systems]
         return test_sets
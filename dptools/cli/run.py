@@ -1,12 +1,6 @@
 import os
-from ruamel.yaml import YAML
-from ase.io import read
-import numpy as np
-
-from dptools.simulate import Simulations
-from dptools.simulate.parameters import get_parameter_sets
-from dptools.utils import read_type_map
-from dptools.cli import BaseCLI
+
+from dptools.cli import BaseCLI, get_input_paths
 from dptools.env import get_dpfaults, load
 
 
@@ -24,6 +18,7 @@ class CLI(BaseCLI):
         $ dptools run cellopt start.traj # simple unit cell optimization
         $ dptools run /path/to/params.yaml start.traj # custom param file simulation
         $ dptools run -s eos 0*/start.traj # submit slurm job eos simulations on multiple structures
+        $ dptools run -j 4 opt 0*/start.traj # run optimizations on 4 structures at a time
         $ dptools run -s -m water nvt-md start.traj # submit slurm nvt-md run using set water model
     """
     help_info = "Run simulation using trained DP model "\
@@ -47,6 +42,8 @@ class CLI(BaseCLI):
                 help="Automatically submit job(s) to train model(s) once input has been created")
         self.parser.add_argument("-g", "--generate-input", action="store_true",
                 help="Only setup calculation and generate input files but do not run calculation")
+        self.parser.add_argument("-j", "--jobs", type=int, default=1,
+                help="Number of simulations to run in parallel when running multiple structures")
         #self.parser.add_argument("-p", "--path", nargs=1, type=str, default="./",
         #        help="Specify path to write simulation files and results to")
         self.parser.add_argument("-o", "--output", type=str, default="{calculation}.traj",
@@ -55,7 +52,8 @@ class CLI(BaseCLI):
     def main(self, args):
         self.set_model(args.model_label)
         self.set_params(args.calculation)
-        self.set_structures(args.structure)
+        # structures are only read by the job itself when submitting
+        self.set_structures(args.structure, read_atoms=not (args.submit or args.generate_input))
         if args.output == "{calculation}.traj": # replace default placeholder name
             args.output = f"{self.calc_type}.traj"
         self.file_out = args.output
@@ -65,7 +63,7 @@ class CLI(BaseCLI):
         elif args.generate_input:
             self.submit_jobs(sub=False)
         else:
-            self.run()
+            self.run(jobs=args.jobs)
 
     def set_params(self, calc_arg):
         """
@@ -77,11 +75,13 @@ class CLI(BaseCLI):
         Args:
             calc_arg (str): simulation keyword (e.g. `opt`) or path to params.yaml file.
         """
+        from ruamel.yaml import YAML
+        from dptools.simulate.parameters import get_parameter_sets
+        from dptools.utils import read_cached
 
         if calc_arg.endswith(".yaml"):
             calc_arg = os.path.abspath(calc_arg)
-            with open(calc_arg) as file:
-                params = YAML().load(file.read())
+            params = read_cached(calc_arg, YAML().load)
         else:
             param_sets = get_parameter_sets()
             params = param_sets[calc_arg]
@@ -110,7 +110,7 @@ class CLI(BaseCLI):
         self.graph, self.type_map = get_dpfaults()
         self._label = model_label # need for submit_jobs()
 
-    def set_structures(self, structures):
+    def set_structures(self, structures, read_atoms=True):
         """
         Read and set structure inputs as ase.Atoms objects and set corresponding dirs.
         Only reads last index unless calc_type == spe, in which case single points are ran
@@ -119,22 +119,22 @@ class CLI(BaseCLI):
         Args:
             structures (list of str): Paths to structure inputs to run simulations
                 on (.traj, .xyz, .cif, etc.).
+            read_atoms (bool): Only set paths and dirs (self.atoms = None) if False.
         """
-
-        index = -1
-        self.structures = [os.path.abspath(s) for s in structures]
-        if len(structures) == 1:
-            dirs = ["."]
-            if self.calc_type == "spe":
-                index = ":"
+        self.structures, self.dirs = get_input_paths(structures)
+        if not read_atoms:
+            self.atoms = None
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+        from ase.io import read
+        index = ":" if len(structures) == 1 and self.calc_type == "spe" else -1
+        if len(self.structures) == 1:
+            self.atoms = [read(self.structures[0], index=index)]
         else:
-            dirs = [os.path.dirname(s) for s in self.structures]
-            if len(np.unique(dirs)) != len(self.structures):
-                # FIXME: Results are overwritten if multiple structure inputs are in the same dir
-                raise Exception("Can't resolve inputs, harass me to fix this")
-
-        self.atoms = [read(s, index=index) for s in self.structures]
-        self.dirs = dirs
+            # overlap file I/O when reading many inputs
+            with ThreadPoolExecutor(max_workers=min(8, len(self.structures))) as executor:
+                self.atoms = list(executor.map(lambda s: read(s, index=index), self.structures))
 
     def submit_jobs(self, sub=True):
         """
@@ -151,7 +151,8 @@ class CLI(BaseCLI):
         f_arg = f"-o {self.file_out}"
         m_arg = f"-m {self._label} " if self._label else ""
         comm_base = f"dptools run {m_arg}{f_arg} {self.calc_arg} "
-        commands = [comm_base + os.path.basename(s) for s in self.structures]
+        basename = os.path.basename
+        commands = [comm_base + basename(s) for s in self.structures]
         jobs = SlurmJob(sbatch_comment,
                         commands=commands,
                         directories=self.dirs,
@@ -161,21 +162,48 @@ class CLI(BaseCLI):
                         )
         jobs.write(sub=sub)
 
-    def run(self):
+    def run(self, jobs=1):
         """
-        Sequentially setup and run simulations on all structure inputs.
+        Setup and run simulations on all structure inputs.
+
+        Args:
+            jobs (int): Number of simulations to run at once (in separate processes).
+                Simulations are ran sequentially if 1.
         """
+        from dptools.utils import read_type_map
+        type_map = read_type_map(self.type_map)
+        sims = [(self.calc_type, atoms, d, self.graph, type_map, self.file_out, dict(self.params))
+                for atoms, d in zip(self.atoms, self.dirs)]
+
+        if jobs > 1 and len(sims) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            # default start method (fork on linux) is fine here, unlike in sample, since this
+            # process never loads deepmd/TF or lammps itself, only the workers do
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                # dirs are absolute for multiple inputs, so each worker can just chdir
+                list(executor.map(_run_simulation, *zip(*sims)))
+            return
+
         wd = os.getcwd()
-        for atoms, d in zip(self.atoms, self.dirs):
-            os.chdir(d)
-            sim = Simulations[self.calc_type](
-                    atoms,
-                    self.graph,
-                    type_map=read_type_map(self.type_map),
-                    file_out=self.file_out,
-                    path=".",
-                    **self.params
-                    )
-
-            sim.run()
+        try:
+            for sim in sims:
+                _run_simulation(*sim)
+        finally:
             os.chdir(wd)
+
+
+def _run_simulation(calc_type, atoms, directory, graph, type_map, file_out, params):
+    """Setup and run single simulation in directory."""
+    from dptools.simulate import Simulations
+    # lammps writes (and simulations read) dump/log files relative to cwd, so
+    # need to move into the simulation dir
+    os.chdir(directory)
+    sim = Simulations[calc_type](
+            atoms,
+            graph,
+            type_map=type_map,
+            file_out=file_out,
+            path=".",
+            **params
+            )
+    sim.run()
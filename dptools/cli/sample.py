@@ -1,11 +1,6 @@
 import os
-import numpy as np
-from ase.io import write
 
-from dptools.train.ensemble import SampleConfigs
-from dptools.cli import BaseCLI
-from dptools.utils import graph2typemap, read_type_map
-from dptools.env import load, get_dpfaults
+from dptools.cli import BaseCLI, get_input_paths
 
 class CLI(BaseCLI):
     """
@@ -21,6 +16,7 @@ class CLI(BaseCLI):
         $ dptools sample -n 200 nvt-md.traj
         $ dptools sample -n 100 --lo 0.05 --hi 0.25 nvt-md.traj
         $ dptools sample -m water_ensemble -p npt-md.traj
+        $ dptools sample -j 4 0*/nvt-md.traj
 
     """
     help_info = "Select new training configs from MD traj "\
@@ -47,26 +43,35 @@ class CLI(BaseCLI):
                 help="Plot histogram of max force deviation of model ensemble for each config")
         self.parser.add_argument("--plot-steps", action="store_true",
                 help="Plot dev versus number of steps")
+        self.parser.add_argument("-j", "--jobs", type=int, default=1,
+                help="Number of configurations inputs to sample from in parallel")
 
 
     def main(self, args):
+        from dptools.utils import read_type_map
         self.outfile = os.path.basename(args.output)
         self.load_ensemble(args.model_ensemble) # sets self.type_map and self.graphs
         self.set_configs(args.configurations)
-        self.devs = [] # max force deviation of model ensemble
-
-        wd = os.getcwd()
-        for configs, dir in zip(self.configs, self.dirs):
-            os.chdir(dir)
-
-            self.sample(configs, args)
-
-            os.chdir(wd)
+        type_map = read_type_map(self.type_map) # same for every input, only read once
+        samples = [(configs, self.ensemble, type_map, d, args.lo, args.hi, args.n, self.outfile)
+                for configs, d in zip(self.configs, self.dirs)]
+        # max force deviation of model ensemble for each input
+        if args.jobs > 1 and len(samples) > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn instead of fork, graph2typemap may have already initialized TF/CUDA
+            # in this process, which forked workers can't safely reuse to load models
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=args.jobs, mp_context=context) as executor:
+                self.devs = list(executor.map(_sample_configs, *zip(*samples)))
+        else:
+            self.devs = [_sample_configs(*sample) for sample in samples]
 
         if args.plot_dev or args.plot_steps:
             self.plot(steps=args.plot_steps)
 
     def load_ensemble(self, ensemble):
+        from dptools.env import load, get_dpfaults
         if not ensemble or len(ensemble) == 1:
             if ensemble is not None and len(ensemble) == 1:
                 load(ensemble[0])
@@ -74,32 +79,29 @@ class CLI(BaseCLI):
             #self.type_map, *ensemble = defaults
             *ensemble, self.type_map = defaults
         else:
+            from dptools.utils import graph2typemap
             self.type_map = graph2typemap(ensemble[0])
         self.ensemble = ensemble
 
     def set_configs(self, configs):
-        self.configs = [os.path.abspath(c) for c in configs]
-        if len(configs) == 1:
-            dirs = ["."]
-        else:
-            dirs = [os.path.dirname(c) for c in self.configs]
-            if len(np.unique(dirs)) != len(self.configs):
-                # FIXME: Results are overwritten if multiple structure inputs are in the same dir
-                raise Exception("Can't resolve inputs, harass me to fix this")
-        self.dirs = dirs
-
-    def sample(self, configs, args):
-        self.sampler = SampleConfigs(configs, self.ensemble, read_type_map(self.type_map))
-        new_configs = self.sampler.sample(lo=args.lo, hi=args.hi, n=args.n)
-
-        self.devs.append(self.sampler.dev)
-        write(self.outfile, new_configs)
+        self.configs, self.dirs = get_input_paths(configs)
 
     def plot(self, steps=False):
         import matplotlib.pyplot as plt
+        from dptools.train.ensemble import plot_dev
         fig, ax = plt.subplots(figsize=(5.5, 4))
         for dev, _dir in zip(self.devs, self.dirs):
-            ax = self.sampler.plot(dev=dev, steps=steps, ax=ax, label=os.path.relpath(_dir))
+            ax = plot_dev(dev, steps=steps, ax=ax, label=os.path.relpath(_dir))
         if len(self.dirs) > 1:
             ax.legend()
         plt.show()
+
+
+def _sample_configs(configs, ensemble, type_map, path, lo, hi, n, outfile):
+    """Select new configs from configs file, write to path/outfile, and return dev."""
+    from ase.io import write
+    from dptools.train.ensemble import SampleConfigs
+    sampler = SampleConfigs(configs, ensemble, type_map, path=path) # streams configs file
+    new_configs = sampler.sample(lo=lo, hi=hi, n=n)
+    write(os.path.join(path, outfile), new_configs)
+    return sampler.dev
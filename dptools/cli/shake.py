@@ -38,30 +38,71 @@ class CLI(BaseCLI):
         self.parser.add_argument("-a", "--adsorbate", action="store_true",
                 help="If specified, identifies and shuffles adsorbates randomly "\
                 "(i.e., -d is ignored for adsorbates)")
+        self.parser.add_argument("-j", "--jobs", type=int, default=1,
+                help="Number of processes to use for shaking and writing structures")
 
     def main(self, args):
         self.atoms = read(args.structure)
         self.n = args.n
         if args.adsorbate:
             self.shuffle_adsorbates()
-        new_atoms = self.shake(dmax=args.displacement)
-        self.write(new_atoms, args.path, args.output)
+        if args.jobs > 1:
+            self.shake_parallel(args.displacement, args.path, args.output, args.jobs)
+        else:
+            self.write(self.shake(dmax=args.displacement), args.path, args.output)
 
     def shake(self, dmax):
-        new_atoms = []
-        for _ in range(self.n):
+        """Yield shaken copies of atoms one at a time (only one copy in memory)."""
+        positions = self.atoms.get_positions()
+        for displacement in self.get_displacements(dmax):
             atoms = self.atoms.copy()
-            atoms.rattle(dmax, seed=seed())
-            new_atoms.append(atoms)
-        return new_atoms
+            atoms.set_positions(positions + displacement)
+            yield atoms
 
-    def write(self, atoms, path, out_file):
+    def get_displacements(self, dmax):
+        """Yield displacements (same normal distribution as ase.Atoms.rattle) for each of
+        the n structures, drawn one at a time from a single seeded generator."""
+        import numpy as np
+        rng = np.random.default_rng(seed())
+        for _ in range(self.n):
+            yield rng.normal(scale=dmax, size=(len(self.atoms), 3))
+
+    def shake_parallel(self, dmax, path, out_file, jobs):
+        from concurrent.futures import ProcessPoolExecutor
+        from itertools import repeat
+        files = [os.path.join(p, out_file) for p in self.make_dirs(path)]
+        displacements = self.get_displacements(dmax)
+        # default start method (fork on linux) is safe, no deepmd/TF involved in shaking
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(_shake_one, repeat(self.atoms), displacements, files))
+
+    def get_paths(self, path):
         dir_dim = len(str(self.n)) if len(str(self.n)) > 3 else 3 # 000-999 unless n >= 1000
-        shake_dirs = [f"{i:0{dir_dim}d}" for i in range(self.n)]
-        paths = [os.path.join(path, d) for d in shake_dirs]
+        shake_dirs = [str(i).zfill(dir_dim) for i in range(self.n)]
+        return [os.path.join(path, d) for d in shake_dirs]
+
+    def make_dirs(self, path):
+        """Create all shake dirs up front so writing is a single pass."""
+        paths = self.get_paths(path)
+        os.makedirs(path, exist_ok=True)
+        for p in paths:
+            try:
+                os.mkdir(p)
+            except FileExistsError:
+                pass
+        return paths
+
+    def write(self, atoms, path, out_file):
+        paths = self.make_dirs(path)
         for a, p in zip(atoms, paths):
-            os.makedirs(p, exist_ok=True)
             a.write(os.path.join(p, out_file))
 
     def shuffle_adsorbates(self):
         raise NotImplementedError("Adsorbate shuffling coming soon-ish")
+
+
+def _shake_one(atoms, displacement, file_out):
+    """Displace copy of atoms and write to file_out."""
+    atoms = atoms.copy()
+    atoms.set_positions(atoms.get_positions() + displacement)
+    atoms.write(file_out)
@@ -1,9 +1,8 @@
 import os
-import glob
 import json
 
 from dptools.cli import BaseCLI
-from dptools.utils import randomize_seed
+from dptools.utils import randomize_seed, read_json, write_json
 from dptools.hpc import SlurmJob
 
 
@@ -20,6 +19,7 @@ class CLI(BaseCLI):
         $ dptools train /path/to/dataset # simple single model
         $ dptools train -e /path/to/dataset # ensemble (4) of models
         $ dptools train -e -s /path/to/dataset # submit 4 slurm jobs to train ensemble
+        $ dptools train -e -s -a /path/to/dataset # submit ensemble as one slurm job array
         $ dptools train -p /path/to/training/dir /path/to/dataset # specify dir to train in
         $ dptools train -i /path/to/in.json /path/to/dataset # specify in.json parameter file
     """
@@ -37,6 +37,9 @@ class CLI(BaseCLI):
                 help="Specify path to training directory")
         self.parser.add_argument("-i", "--input", type=str, default=None,
                 help="Specify path to in.json deepmd parameter file to use for training")
+        self.parser.add_argument("-a", "--array", action="store_true",
+                help="Write (and submit) ensemble as a single Slurm job array instead of "\
+                        "one job per model")
 
     def main(self, args):
         if args.dataset == ".":
@@ -56,6 +59,7 @@ class CLI(BaseCLI):
         else:
             self.dirs = [self.path]
         self._sub = args.submit
+        self._array = args.array and len(self.dirs) > 1
         self.setup()
         self.submit_jobs()
 
@@ -66,12 +70,13 @@ class CLI(BaseCLI):
         training dir.
         """
 
-        with open(self._json, "r") as file:
-            in_json = json.loads(file.read())
+        in_json = read_json(self._json)
+        # dataset dirs and types are the same for each model, only seeds change
+        in_json = self.set_types(self.link_dirs(in_json))
+        for d in self.dirs:
+            os.makedirs(d, exist_ok=True)
         for d in self.dirs:
             jsn = randomize_seed(in_json)
-            jsn = self.link_dirs(jsn)
-            jsn = self.set_types(jsn)
             self.write_json(jsn, d)
 
     @staticmethod
@@ -81,12 +86,9 @@ class CLI(BaseCLI):
 
         Args:
             src (dict): jsonnable dictionary with deepmd-kit training parameters.
-            dest (str): Path to training directory to write .json file to
+            dest (str): Path to (existing) training directory to write .json file to
         """
-        os.makedirs(dest, exist_ok=True)
-        file_path = os.path.join(dest, "in.json")
-        with open(file_path, "w") as file:
-            file.write(json.dumps(src, indent=4))
+        write_json(src, os.path.join(dest, "in.json"))
 
     def link_dirs(self, in_json):
         """
@@ -96,8 +98,9 @@ class CLI(BaseCLI):
         Args:
             in_json (dict): jsonnable dictionary with deepmd-kit training parameters.
         """
-        possible_dirs = sorted(glob.glob(f"{self.datapath}/*"))
-        dirs = [d for d in possible_dirs if self._check_dir(d)]
+        with os.scandir(self.datapath) as entries: # hidden dirs skipped like glob("*")
+            dirs = sorted(e.path for e in entries
+                    if not e.name.startswith(".") and e.is_dir() and self._check_dir(e.path))
         train = [os.path.join(d, "train") for d in dirs]
         validation = [os.path.join(d, "validation") for d in dirs]
         in_json["training"]["training_data"]["systems"] = train
@@ -114,7 +117,7 @@ class CLI(BaseCLI):
         if not hasattr(self, "types"): # only need to read type_map once
             type_map_path = os.path.join(self.datapath, "type_map.json")
             with open(type_map_path, "r") as file:
-                type_map = json.loads(file.read())
+                type_map = json.load(file)
             self.types = [type_map[str(i)] for i in range(len(type_map))]
 
         in_json["model"]["type_map"] = self.types
@@ -133,9 +136,13 @@ class CLI(BaseCLI):
         """
         if not os.path.isdir(directory):
             return False
-        check1 = "train" in os.listdir(directory)
-        check2 = "validation" in os.listdir(directory)
-        return check1 and check2
+        needed = {"train", "validation"}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                needed.discard(entry.name)
+                if not needed:
+                    return True
+        return False
 
     @staticmethod
     def get_hpc_info():
@@ -161,5 +168,6 @@ class CLI(BaseCLI):
                         commands=commands,
                         directories=self.dirs,
                         file_name="dptools.train.sh",
+                        array=self._array,
                         **hpc_info)
         jobs.write(sub=self._sub)
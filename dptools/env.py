@@ -9,27 +9,57 @@ so use at your own risk.
 """
 import os
 import re
-import json
 import socket
 import dotenv
 
-from dptools.utils import typemap2str, graph2typemap
+from dptools.utils import typemap2str, graph2typemap, read_json, write_json, stamp_cached
 from dptools.hpc import hpc_defaults
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 default_env_file = os.path.join(basedir, ".env")
 env_file = default_env_file
+_env_values = {} # {env_file: ((mtime, size), values)}, cleared whenever an env file is modified
+# matches "#SBATCH <params>" (group 1) or "export <key>=<value>" (groups 2, 3) lines
+_sbatch_pattern = re.compile(r"^[ \t]*(?:#SBATCH(.*)|export[ \t]+([^=\s]+)=(\S*))", re.MULTILINE)
+
+
+def _clear_cache():
+    _env_values.clear()
 
 
 def set_env(key, value):
     """Set key-value to global env file."""
+    _clear_cache()
     dotenv.set_key(env_file, key, value)
 
 
+def set_envs(values, unset=()):
+    """
+    Set multiple key-values to (and optionally remove keys from) global env file,
+    rewriting the file once instead of once per key like set_env.
+
+    Args:
+        values (dict): Key-values to set.
+        unset (iterable): Keys to remove from env file.
+    """
+    _clear_cache()
+    env = dotenv.dotenv_values(env_file) if os.path.isfile(env_file) else {}
+    env = {k: v for k, v in env.items() if k not in unset and v is not None}
+    env.update(values)
+    lines = []
+    for k, v in env.items():
+        escaped = str(v).replace("\\", "\\\\").replace("'", "\\'") # same quoting as set_key
+        lines.append(f"{k}='{escaped}'\n")
+    with open(env_file, "w") as file:
+        file.write("".join(lines))
+
+
 def get_env():
     """Get all key-values from global env file."""
-    values = dotenv.dotenv_values(env_file)
-    return values
+    try:
+        return dict(stamp_cached(_env_values, env_file, dotenv.dotenv_values))
+    except FileNotFoundError:
+        return {}
 
 
 def load(label):
@@ -86,8 +116,7 @@ def set_default_sbatch(warn=True):
     """
     host = re.sub("[^a-z]*", "", socket.gethostname())
     try:
-        for k, v in hpc_defaults[host].items():
-            set_env(k, str(v))
+        set_envs({k: str(v) for k, v in hpc_defaults[host].items()})
         if warn:
             print("WARNING: setting default HPC parameters to env")
             print("-" * 64)
@@ -104,6 +133,7 @@ def clear(keys):
     """
     Clear specific key-values (or entire env) for loaded global env file.
     """
+    _clear_cache()
     if keys is all:
         os.remove(env_file)
     else:
@@ -113,18 +143,20 @@ def clear(keys):
                 dotenv.unset_key(env_file, key)
 
 
+model_keys = (
+        "DPTOOLS_TYPE_MAP",
+        "DPTOOLS_MODEL",
+        "DPTOOLS_MODEL2",
+        "DPTOOLS_MODEL3",
+        "DPTOOLS_MODEL4",
+        )
+
+
 def clear_model():
     """
     Clear model related key-values from loaded global env file.
     """
-    keys = [
-            "DPTOOLS_TYPE_MAP",
-            "DPTOOLS_MODEL",
-            "DPTOOLS_MODEL2",
-            "DPTOOLS_MODEL3",
-            "DPTOOLS_MODEL4",
-        ]
-    clear(keys)
+    clear(model_keys)
 
 
 def set_model(model, n_model=""):
@@ -132,14 +164,12 @@ def set_model(model, n_model=""):
     Set path to deepmd model .pb file to use during simulations evoked by CLI
     :doc:`../commands/run` command.
     """
-    if not n_model:
-        clear_model()
     graph = os.path.abspath(model)
-    set_env(f"DPTOOLS_MODEL{n_model}", graph)
-    if not n_model: # only write type_map once if setting ensemble of models
-        type_map = graph2typemap(graph)
-        type_map_str = typemap2str(type_map)
-        set_env("DPTOOLS_TYPE_MAP", type_map_str)
+    if n_model:
+        set_env(f"DPTOOLS_MODEL{n_model}", graph)
+    else: # clear old model(s) and only write type_map once if setting ensemble of models
+        type_map_str = typemap2str(graph2typemap(graph))
+        set_envs({"DPTOOLS_MODEL": graph, "DPTOOLS_TYPE_MAP": type_map_str}, unset=model_keys)
 
 
 def set_sbatch(script):
@@ -150,16 +180,16 @@ def set_sbatch(script):
         script (str): Path to .sh script with #SBATCH comments to set Slurm params.
     """
     with open(script) as file:
-        lines = [l.strip() for l in file]
+        text = file.read()
     sbatch_vars = []
-    for l in lines:
-        if l.startswith("#SBATCH"):
-            sbatch_vars.extend(l.split()[1:])
-        elif l.startswith("export"):
-            var = l.split()[1]
-            set_env(*var.split("="))
-    sbatch_comment = "#SBATCH " + " ".join(sbatch_vars)
-    set_env("SBATCH_COMMENT", sbatch_comment)
+    exports = {}
+    for sbatch, k, v in _sbatch_pattern.findall(text): # one pass instead of checking each line
+        if k:
+            exports[k] = v
+        else:
+            sbatch_vars.extend(sbatch.split())
+    exports["SBATCH_COMMENT"] = "#SBATCH " + " ".join(sbatch_vars)
+    set_envs(exports)
 
 
 def set_params(params):
@@ -175,8 +205,7 @@ def set_training_params(in_json):
     Save deepmd-kit training parameters to use with CLI :doc:`../commands/train` command.
     """
     if isinstance(in_json, str):
-        with open(in_json) as file:
-            in_json = json.loads(file.read())
+        in_json = read_json(in_json)
     if not in_json.get("model"):
         # check if correct param file/dict was given before overwriting default file
         raise KeyError("No model parameters found in json file.")
@@ -186,6 +215,4 @@ def set_training_params(in_json):
     in_json["training"]["training_data"]["systems"] = []
     in_json["training"]["validation_data"]["systems"] = []
 
-    path = os.path.join(basedir, "train/in.json")
-    with open(path, "w") as file:
-        file.write(json.dumps(in_json, indent=4))
+    write_json(in_json, os.path.join(basedir, "train/in.json"))
@@ -2,6 +2,8 @@
 Module for controlling HPC job submissions. Currently only supports Slurm jobs.
 """
 import os
+import re
+import subprocess
 
 # defaults for Kulkarni group hpc systems
 hpc_defaults = {
@@ -21,6 +23,9 @@ hpc_defaults = {
             },
         }
 
+# matches Slurm log file params, e.g. "--output=job.out", "--error job.err", or "-o job.out"
+_log_pattern = re.compile(r"((?:^|\s)(?:--output|--error)[= ]|(?:^|\s)-[oe]\s+)(\S+)")
+
 # TODO: Split sbatch into n_nodes, n_tasks_per_node, etc.
 class SlurmJob:
     """
@@ -51,6 +56,13 @@ class SlurmJob:
 
             If False, then the same command(s) is used in all submission directories.
 
+        array (bool): Set to True to write a single job array script (in the common parent of
+            directories) instead of one script per directory. Each array task cd's into its
+            directory using $SLURM_ARRAY_TASK_ID, so the whole set is submitted with one sbatch
+            call. Can not be used with zip_commands. Log files (--output/--error) without %a
+            get the array task index inserted (e.g., job.out -> job_%a.out) so tasks don't
+            overwrite each other's logs.
+
         **kwargs: Unpacked dict containing any env variables to set in submission script.
             e.g. :python:`kwargs = dict(TF_INTRA_OP_PARALLELISM_THREADS="1")` adds this
             line to .sh script,
@@ -65,34 +77,56 @@ class SlurmJob:
                  directories=".",
                  file_name="script.sh",
                  zip_commands=False,
+                 array=False,
                  **kwargs
                  ):
 
+        if array and zip_commands:
+            raise ValueError("zip_commands can not be used with job arrays")
         self.sbatch = sbatch_comment
         self._zip = zip_commands
+        self._array = array
         self.commands = commands
         self.set_path_stuff(directories, file_name)
         self.set_text(**kwargs)
 
     def get_header(self):
-        header = f"#!/usr/bin/env bash\n{self.sbatch}\n"
+        sbatch = self._split_logs(self.sbatch) if self._array else self.sbatch
+        header = f"#!/usr/bin/env bash\n{sbatch}\n"
         return header
 
+    @staticmethod
+    def _split_logs(sbatch):
+        """Insert %a (array task index) into log file names that would be shared by all tasks."""
+        def per_task(match):
+            log = match.group(2)
+            if "%a" in log:
+                return match.group(0)
+            root, ext = os.path.splitext(log)
+            return match.group(1) + f"{root}_%a{ext}"
+        return _log_pattern.sub(per_task, sbatch)
+
     def set_path_stuff(self, directories, file_name):
         if isinstance(directories, str):
             directories = [directories]
-        self.directories = [os.path.abspath(d) for d in directories]
+        cwd = os.getcwd() # only look up once instead of in abspath for each dir
+        self.directories = [os.path.normpath(os.path.join(cwd, d)) for d in directories]
         self.file_name = file_name
-        self.paths = [os.path.join(d, file_name) for d in self.directories]
+        if self._array:
+            self.array_dir = os.path.commonpath(self.directories)
+            self.paths = [os.path.join(self.array_dir, file_name)]
+        else:
+            self.paths = [os.path.join(d, file_name) for d in self.directories]
 
     def set_text(self, **kwargs):
         header = self.get_header()
 
-        exports = ""
-        for k, v in kwargs.items():
-            exports += f"export {k}={v}\n"
+        exports = "".join(f"export {k}={v}\n" for k, v in kwargs.items())
 
         body = "\n"
+        if self._array:
+            dirs = " ".join(f'"{d}"' for d in self.directories)
+            body += f"dirs=({dirs})\ncd \"${{dirs[$SLURM_ARRAY_TASK_ID]}}\"\n\n"
         if not self._zip and isinstance(self.commands, list):
             for comm in self.commands:
                 body += comm + "\n"
@@ -122,15 +156,28 @@ class SlurmJob:
             yield comm
 
     def write_script(self, path):
+        text = self.text # only access once, consumes next command if self._zip
+        if os.path.isfile(path):
+            with open(path, "r") as file:
+                if file.read() == text:
+                    return # skip rewriting identical scripts, e.g. when resubmitting
         with open(path, "w") as file:
-            file.write(self.text)
+            file.write(text)
 
     def write(self, sub=False):
+        if self._array:
+            self.write_script(self.paths[0])
+            if sub:
+                array = f"--array=0-{len(self.directories) - 1}"
+                subprocess.run(["sbatch", array, self.file_name], cwd=self.array_dir)
+            return
+        jobs = []
         for directory, path in zip(self.directories, self.paths):
             self.write_script(path)
-            if sub:
-                os.chdir(directory)
-                os.system(f"sbatch {self.file_name}")
+            if sub: # submit without waiting, so sbatch calls for all dirs run at once
+                jobs.append(subprocess.Popen(["sbatch", self.file_name], cwd=directory))
+        for job in jobs:
+            job.wait()
 
     def submit(self):
         self.write(sub=True)
@@ -7,6 +7,8 @@ import os
 import requests
 from ruamel.yaml import YAML
 
+from dptools.utils import read_cached
+
 basedir = os.path.abspath(os.path.dirname(__file__))
 param_file = os.path.join(basedir, "parameter_sets.yaml")
 
@@ -57,11 +59,10 @@ def write_yaml(param_dict, file):
 
 def get_parameter_sets():
     """
-    Load simulation parameter sets from parameter_sets.yaml.
+    Load simulation parameter sets from parameter_sets.yaml. File is only parsed
+    again if it has changed since the last call.
     """
-    with open(param_file) as file:
-        parameter_sets = YAML().load(file.read())
-    return parameter_sets
+    return read_cached(param_file, lambda file: YAML().load(file))
 
 
 def set_parameter_set(param_dict):
@@ -74,7 +75,7 @@ def set_parameter_set(param_dict):
     """
     if isinstance(param_dict, str):
         with open(param_dict) as file:
-            param_dict = YAML(typ="safe").load(file.read())
+            param_dict = YAML(typ="safe").load(file)
     parameter_sets = get_parameter_sets()
     calc_type = param_dict.get("type")
     parameter_sets[calc_type] = param_dict
@@ -1,5 +1,18 @@
-from dptools.train.ensemble import SampleConfigs
-from dptools.train.input import DeepInput, DeepInputs
-from dptools.train.parity import EvaluateDP
+import importlib
+
+# classes are only imported from their modules when first accessed, so importing one
+# module (e.g., dptools.train.input for the CLI) doesn't import the rest (matplotlib, etc.)
+_classes = {
+        "SampleConfigs": "dptools.train.ensemble",
+        "DeepInput": "dptools.train.input",
+        "DeepInputs": "dptools.train.input",
+        "EvaluateDP": "dptools.train.parity",
+        }
 
 __all__ = ["DeepInput", "DeepInputs", "EvaluateDP", "SampleConfigs"]
+
+
+def __getattr__(name):
+    if name in _classes:
+        return getattr(importlib.import_module(_classes[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,39 @@
 """
 Module for working with ensembles of DP models.
 """
-from ase.io import read, write
+from ase.data import chemical_symbols
+from ase.io import iread
+from itertools import islice
 import numpy as np
-import random
 import os
 
-from dptools.utils import graph2typemap, next_color
+from dptools.utils import graph2typemap, next_color, stamp_cached, get_seed
+
+_models = {} # loaded DeepPot models, {abspath: ((mtime, size), model)}
+
+
+def _load_model(graph):
+    """Load DeepPot model, reusing the loaded model if graph is unchanged since last load."""
+    from deepmd.infer import DeepPot as DP
+    return stamp_cached(_models, graph, DP)
+
+
+def _frame_hash(atoms):
+    return hash((atoms.numbers.tobytes(), atoms.positions.tobytes(), atoms.cell.array.tobytes()))
+
+
+def max_force_dev(forces):
+    """
+    Calculate eps_t (max force prediction deviation) for a batch of configs.
+
+    Args:
+        forces (np.ndarray): Forces predicted by each model, shape (models, configs, atoms, 3).
+
+    Returns:
+        dev (np.ndarray): eps_t for each config.
+    """
+    return np.sqrt(forces.var(axis=0).sum(axis=-1)).max(axis=-1)
+
 
 class SampleConfigs:
     """
@@ -27,45 +54,150 @@ class SampleConfigs:
     for automatically and efficiently training deepmd-kit MLPs.
 
     Args:
-        configs (list[ase.Atoms] or str): List of atomic configurations from MD trajectory
-            (or str to .traj, .xyz, etc. that contains configs) to sample from.
+        configs (list[ase.Atoms] or str): List (or any iterable, e.g. from ase.io.iread) of
+            atomic configurations from MD trajectory (or str to .traj, .xyz, etc. that
+            contains configs) to sample from. Configs are streamed from file in batches
+            if str is given, so the full trajectory is never held in memory.
         graphs (list[str]): List of paths to ensemble of deepmd models (.pb files).
             e.g., ['00/graph.pb', '01/graph.pb', '02/graph.pb', '03/graph.pb']
         type_map (dict, optional): Dictionary mapping each atom type (symbol) to
             corresponding index. If None specified, infer from graph file.
         indices (str): Index slice to use for reading configs if str input supplied
-            (used in command ase.io.read(config, index=indices)).
+            (used in command ase.io.iread(config, index=indices)).
+        path (str): Path to directory to read/write dev.npy (eps_t values) from/to. dev.key
+            records the configs and models dev.npy was calculated with.
     """
-    def __init__(self, configs, graphs, type_map=None, indices=":"):
+    def __init__(self, configs, graphs, type_map=None, indices=":", path="."):
         if isinstance(configs, str):
-            self.configs = read(configs, index=indices)
+            self.configs = None # stream from self.file, see iter_configs()
+        elif not isinstance(configs, list):
+            self.configs = list(configs)
         else:
             self.configs = configs
         if not type_map:
             type_map = graph2typemap(graphs[0])
         self.type_map = type_map
         self.graphs = graphs
+        self.path = path
+        self.file = configs if isinstance(configs, str) else None
+        self.indices = indices
+
+    def iter_configs(self):
+        """Iterate over configs, reading them one at a time if configs file given."""
+        if self.configs is None:
+            return iread(self.file, index=self.indices)
+        return iter(self.configs)
+
+    def get_configs(self, indices):
+        """
+        Args:
+            indices (list[int]): Sorted indices of configs to get.
 
-    def get_dev(self):
-        if "dev.npy" in os.listdir():
-            old_dev = np.load("dev.npy")
-            if len(old_dev) == len(self.configs): # only read dev if configs haven't changed
-                print(f"Reading dev from {os.path.abspath('dev.npy')} ...")
+        Returns:
+            (list[ase.Atoms]): Configs at indices.
+        """
+        if self.configs is not None:
+            return [self.configs[i] for i in indices]
+        configs = []
+        wanted = iter(indices)
+        i_next = next(wanted, None)
+        for i, atoms in enumerate(self.iter_configs()):
+            if i_next is None:
+                break
+            if i == i_next:
+                configs.append(atoms)
+                i_next = next(wanted, None)
+        return configs
+
+    def _dev_key(self):
+        """Hash identifying the configs and models that dev is calculated from."""
+        import hashlib
+        if self.configs is None:
+            parts, files = [str(self.indices)], [self.file, *self.graphs]
+        else:
+            parts, files = [str(len(self.configs))], self.graphs
+        for f in files:
+            parts.append(os.path.abspath(f))
+            if os.path.isfile(f):
+                stat = os.stat(f)
+                parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()
+
+    def _read_old_dev(self, dev_file, key_file):
+        # only read dev if configs (and models) haven't changed. dev.npy without dev.key
+        # (written by older versions) is treated as outdated and recalculated once
+        if not os.path.isfile(key_file):
+            return None
+        with open(key_file) as file:
+            if file.read().strip() != self._dev_key():
+                return None
+        return np.load(dev_file)
+
+    def get_dev(self, batch_size=256):
+        """
+        Calculate eps_t for all configs (or read from dev.npy if already calculated).
+
+        Args:
+            batch_size (int): Number of configs to evaluate with each model at once.
+
+        Returns:
+            dev (np.ndarray): eps_t for each config.
+        """
+        dev_file = os.path.join(self.path, "dev.npy")
+        key_file = os.path.join(self.path, "dev.key")
+        if os.path.isfile(dev_file):
+            old_dev = self._read_old_dev(dev_file, key_file)
+            if old_dev is not None:
+                print(f"Reading dev from {os.path.abspath(dev_file)} ...")
                 return old_dev
 
-        from deepmd.infer import calc_model_devi
-        from deepmd.infer import DeepPot as DP
-        pos = np.array([a.get_positions().flatten() for a in self.configs])
-        cell = np.array([a.cell.array.flatten() for a in self.configs])
-        types = [self.type_map[a.symbol] for a in self.configs[0]]
+        models = [_load_model(g) for g in self.graphs]
+
+        configs = self.iter_configs()
+        dev = []
+        seen = {} # {frame hash: dev}, duplicate frames (e.g., from restarts) only evaluated once
+        while True:
+            batch = list(islice(configs, batch_size))
+            if not batch:
+                break
+            keys = [_frame_hash(atoms) for atoms in batch]
+            unique = {}
+            for key, atoms in zip(keys, batch):
+                if key not in seen:
+                    unique.setdefault(key, atoms)
+            if unique:
+                seen.update(zip(unique, self._batch_dev(list(unique.values()), models)))
+            dev.append(np.array([seen[key] for key in keys]))
+        dev = np.concatenate(dev) if dev else np.array([])
+        np.save(dev_file, dev)
+        with open(key_file, "w") as file:
+            file.write(self._dev_key())
+        return dev
+
+    def _batch_dev(self, configs, models):
+        # group configs with identical atom types into one eval call per model
+        groups = {}
+        for i, atoms in enumerate(configs):
+            groups.setdefault(tuple(atoms.numbers), []).append(i)
 
-        models = [DP(g) for g in self.graphs]
+        dev = np.empty(len(configs))
+        for indices in groups.values():
+            group = [configs[i] for i in indices]
+            n_frames, n_atoms = len(group), len(group[0])
+            pos = np.empty((n_frames, n_atoms, 3))
+            cell = np.empty((n_frames, 3, 3))
+            np.stack([a.positions for a in group], out=pos)
+            np.stack([a.cell.array for a in group], out=cell)
+            # look up type index once per element, not once per atom
+            elements, inverse = np.unique(group[0].numbers, return_inverse=True)
+            types = np.array([self.type_map[chemical_symbols[z]] for z in elements])[inverse]
 
-        try:
-            dev = calc_model_devi(pos, cell, types, models, nopbc=False)[:, 4]
-        except TypeError: # nopbc removed in later deepmd-kit versions
-            dev = calc_model_devi(pos, cell, types, models)[:, 4]
-        np.save("dev.npy", dev)
+            # each model writes straight into its slice of one (models, frames, atoms, 3) array
+            forces = np.empty((len(models), n_frames, n_atoms, 3))
+            for m, model in enumerate(models):
+                forces[m] = model.eval(pos.reshape(n_frames, -1), cell.reshape(n_frames, -1),
+                        types)[1].reshape(n_frames, n_atoms, 3)
+            dev[indices] = max_force_dev(forces)
         return dev
 
     def sample(self, lo=0.05, hi=0.35, n=300):
@@ -103,19 +235,18 @@ class SampleConfigs:
             print(warn)
 
         self.dev = self.get_dev()
-        i_configs = np.where(np.logical_and(self.dev>=lo, self.dev<=hi))[0]
+        i_configs = np.flatnonzero((self.dev >= lo) & (self.dev <= hi))
         n_sample = n if n < len(i_configs) else len(i_configs)
-        i_new_configs = random.sample(list(i_configs), n_sample)
-        new_configs = [self.configs[i] for i in sorted(i_new_configs)]
+        # random choice within tolerance (not top-n), only the n chosen indices are sorted
+        # seeded from global numpy state so np.random.seed still reproduces the selection
+        rng = np.random.default_rng(get_seed())
+        i_new_configs = rng.choice(i_configs, n_sample, replace=False)
+        new_configs = self.get_configs(np.sort(i_new_configs).tolist())
         return new_configs
 
     def plot(self, dev=None, steps=False, ax=None, color=None, label=None):
         """
-        Create kernel density estimation plot (fancy smooth histogram) for
-        all eps_t values in configs input.
-
-        Requires seaborn python package to be installed!
-        https://seaborn.pydata.org
+        Plot eps_t values for configs input, see :func:`plot_dev`.
 
         Args:
             dev (array-like): Optional list of dev values to plot, calculate if None given.
@@ -125,25 +256,44 @@ class SampleConfigs:
             color (str): Color to use for plot.
             label (str): Label to use for legend entry.
         """
-        import matplotlib.pyplot as plt
-        import seaborn as sns
         if dev is None:
             if hasattr(self, "dev"):
                 dev = self.dev
             else:
                 dev = self.get_dev()
-        ax = plt.gca() if ax is None else ax
-        color = next_color() if color is None else color
+        return plot_dev(dev, steps=steps, ax=ax, color=color, label=label)
 
-        if steps:
-            ax.set_xlabel("Steps / write_freq", fontsize=14)
-            ax.set_ylabel("$\epsilon_t$ (eV/Å)", fontsize=14)
-            plt.plot(np.arange(len(dev)), dev, '-', color=color, label=label or "")
-        else:
-            sns.kdeplot(dev, fill=True, color=color, label=label or "")
-            ax.set_ylabel("Density", fontsize=14)
-            ax.set_xlabel("$\epsilon_t$ (eV/Å)", fontsize=14)
-        ax.locator_params('both', nbins=5)
-        ax.tick_params(labelsize=12)
-        plt.tight_layout()
-        return ax
+
+def plot_dev(dev, steps=False, ax=None, color=None, label=None):
+    """
+    Create kernel density estimation plot (fancy smooth histogram) for
+    eps_t values (e.g., from SampleConfigs.get_dev or dev.npy).
+
+    Requires seaborn python package to be installed!
+    https://seaborn.pydata.org
+
+    Args:
+        dev (array-like): eps_t values to plot.
+        steps (bool): If False, plot histogram of dev values. If True, plot dev versus
+            step number (divided by write_freq).
+        ax (Axes): Specific mpl Axes to plot on.
+        color (str): Color to use for plot.
+        label (str): Label to use for legend entry.
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    ax = plt.gca() if ax is None else ax
+    color = next_color() if color is None else color
+
+    if steps:
+        ax.set_xlabel("Steps / write_freq", fontsize=14)
+        ax.set_ylabel("$\epsilon_t$ (eV/Å)", fontsize=14)
+        plt.plot(np.arange(len(dev)), dev, '-', color=color, label=label or "")
+    else:
+        sns.kdeplot(dev, fill=True, color=color, label=label or "")
+        ax.set_ylabel("Density", fontsize=14)
+        ax.set_xlabel("$\epsilon_t$ (eV/Å)", fontsize=14)
+    ax.locator_params('both', nbins=5)
+    ax.tick_params(labelsize=12)
+    plt.tight_layout()
+    return ax
@@ -5,11 +5,7 @@ import os
 import glob
 import json
 import numpy as np
-from ase.db import connect
-from ase.io import read
 from ase.data import atomic_numbers
-from ase.io.formats import string2index
-from sklearn.utils import shuffle
 
 
 class DeepInput:
@@ -52,49 +48,60 @@ class DeepInput:
         self.write_input()
 
     def set_dataset(self):
-        positions = []
-        energies = []
-        forces = []
-        box = []
+        from ase.db import connect
+        from ase.io import read
+        from dptools.utils import get_seed
+
         n = self.n
+        positions, forces, energies, box = self._allocate(0, 0)
 
         if self.atoms_file.endswith(".db"): # TODO: Rework this mess
             with connect(self.atoms_file) as db:
-                for row in db.select():
+                n_images = db.count()
+                # only fetch/decode the columns needed here, skipping data and key_value_pairs
+                columns = ["id", "numbers", "positions", "cell", "forces", "energy"]
+                for i, row in enumerate(db.select(columns=columns, include_data=False)):
                     if not hasattr(self, "atoms"):
-                        self.atoms = row.toatoms() # saving for atom typing
+                        self.atoms = db.get(id=row.id).toatoms() # saving for atom typing
                     self._check_indexing(list(row.numbers))
-                    positions.append(row.positions.flatten())
-                    forces.append(row.forces.flatten())
-                    energies.append(row.energy)
-                    box.append(row.cell.flatten())
+                    if i == 0:
+                        positions, forces, energies, box = self._allocate(n_images, row.natoms)
+                    positions[i] = row.positions.ravel()
+                    forces[i] = row.forces.ravel()
+                    energies[i] = row.energy
+                    box[i] = row.cell.ravel()
         else:
             all_atoms = read(self.atoms_file, index=":")
-            for atoms in all_atoms:
+            for i, atoms in enumerate(all_atoms):
                 if not hasattr(self, "atoms"):
                     self.atoms = atoms.copy() # saving for atom typing
                 self._check_indexing(list(atoms.numbers))
-                positions.append(atoms.positions.flatten())
-                forces.append(atoms.get_forces(apply_constraint=0).flatten())
-                energies.append(atoms.get_potential_energy())
-                box.append(atoms.cell.array.flatten())
-
-        positions = np.array(positions)
-        forces = np.array(forces)
-        energies = np.array(energies)
-        box = np.array(box)
-        positions, energies, forces, box = shuffle(positions, energies, forces, box)
-
+                if i == 0:
+                    positions, forces, energies, box = self._allocate(len(all_atoms), len(atoms))
+                positions[i] = atoms.positions.ravel()
+                forces[i] = atoms.get_forces(apply_constraint=0).ravel()
+                energies[i] = atoms.get_potential_energy()
+                box[i] = atoms.cell.array.ravel()
+
+        # shuffle images, only taking (and copying) the first n if n specified
+        # seeded from global numpy state so np.random.seed still reproduces splits
+        perm = np.random.default_rng(get_seed()).permutation(len(energies))
         if n is not None and n < len(energies):
-            positions = positions[:n]
-            energies = energies[:n]
-            forces = forces[:n]
-            box = box[:n]
+            perm = perm[:n]
 
-        self.positions = positions
-        self.energies = energies
-        self.forces = forces
-        self.box = box
+        self.positions = positions[perm]
+        self.energies = energies[perm]
+        self.forces = forces[perm]
+        self.box = box[perm]
+
+    @staticmethod
+    def _allocate(n_images, n_atoms):
+        """Allocate arrays that are filled with each image's data in set_dataset."""
+        positions = np.empty((n_images, 3 * n_atoms))
+        forces = np.empty((n_images, 3 * n_atoms))
+        energies = np.empty(n_images)
+        box = np.empty((n_images, 9))
+        return positions, forces, energies, box
 
     def _check_indexing(self, numbers):
         if not hasattr(self, "_ref"):
@@ -130,18 +137,20 @@ class DeepInput:
                 raise ValueError(f"Need more images in {self.atoms_file}, \
                         {len(self.energies)} entries")
 
+        splits = {
+                "train": slice(None, n_train),
+                "validation": slice(n_train, n_val),
+                "test": slice(n_val, None),
+                }
         self.write_types()
-        self.write_npy_set("train", ":" + str(n_train))
-        self.write_npy_set("validation", str(n_train) + ":" + str(n_val))
-        self.write_npy_set("test", str(n_val) + ":")
+        for dataset, indices in splits.items():
+            self.write_npy_set(dataset, indices)
 
     def write_npy_set(self, dataset, indices):
-        indices = string2index(indices)
         path = self.paths[dataset]
-        self._write_npy_file(path, "coord", self.positions[indices])
-        self._write_npy_file(path, "force", self.forces[indices])
-        self._write_npy_file(path, "energy", self.energies[indices])
-        self._write_npy_file(path, "box", self.box[indices])
+        arrays = {"coord": self.positions, "force": self.forces, "energy": self.energies, "box": self.box}
+        for key, vals in arrays.items():
+            self._write_npy_file(path, key, vals[indices]) # slices are views, no copying
 
     def _write_npy_file(self, path, key, vals):
         file_name = os.path.join(path, f"{key}.npy")
@@ -151,7 +160,8 @@ class DeepInput:
                 # check for matching system sizes if appending to old dataset
                 raise ValueError(f"Tried appending to {file_name} but size mismatch found.")
             vals = np.append(old_vals, vals, axis=0)
-        np.save(file_name, vals)
+        with open(file_name, "wb") as file: # skip np.save's path handling and array conversion
+            np.lib.format.write_array(file, vals, allow_pickle=False)
 
     def write_types(self):
         symbols = self.atoms.get_chemical_symbols()
@@ -162,11 +172,12 @@ class DeepInput:
             # inverting type_map, confusing and should probably be reworked
             type_keys = {v: k for k, v in self.type_map.items()}
 
-        types = [type_keys[s] for s in symbols]
+        types = "".join(f"{type_keys[s]} " for s in symbols) # same format as np.savetxt(newline=" ")
 
         type_paths = [os.path.join(path, "../type.raw") for s, path in self.paths.items()]
         for path in type_paths:
-            np.savetxt(path, types, fmt="%.1i", newline=" ")
+            with open(path, "w") as file:
+                file.write(types)
 
         self.type_map = {v: k for k, v in type_keys.items()}
 
@@ -234,8 +245,8 @@ class DeepInputs:
         self.write_json()
 
     def set_json(self):
-        with open(self._json_file, "r") as file:
-            self.input_json = json.loads(file.read())
+        from dptools.utils import read_json
+        self.input_json = read_json(self._json_file)
 
     def update_json(self):
         self.set_systems()
@@ -254,9 +265,8 @@ class DeepInputs:
         self.input_json["training"]["validation_data"]["systems"] = get_paths("validation")
 
     def write_json(self):
-        json_str = json.dumps(self.input_json, indent=4)
-        with open("in.json", "w") as file:
-            file.write(json_str)
+        from dptools.utils import write_json
+        write_json(self.input_json, "in.json")
 
     @staticmethod
     def _check_names(input_files, system_names):
@@ -271,6 +281,9 @@ class DeepInputs:
             raise ValueError(err)
 
     def get_atoms(self, db_names):
+        from ase.db import connect
+        from ase.io import read
+
         atoms = []
         for dbn in db_names:
             if dbn.endswith(".db"):
@@ -299,7 +312,7 @@ class DeepInputs:
         if "type_map.json" in os.listdir(self.path):
             print(f"READING {tm_path}")
             with open(tm_path, "r") as file:
-                type_map = json.loads(file.read())
+                type_map = json.load(file)
             type_map = {int(i): s for i, s in type_map.items()}
         else:
             symbols = []
@@ -8,6 +8,13 @@ from ase.io.formats import string2index, UnknownFileTypeError
 from ase.db import connect
 from ase.data import chemical_symbols
 import json
+import copy
+import os
+
+try:
+    import orjson # optional, faster json parsing
+except ImportError:
+    orjson = None
 
 #seaborn.color_palette('deep')
 colors = [(0.2980392156862745, 0.4470588235294118, 0.6901960784313725),
@@ -51,7 +58,8 @@ def read_dump(dump, type_map, index=":"):
     Args:
         dump (str): Path to dump file to read.
         type_map (dict): Dictionary with element-index mapping, e.g. {'Si': 0, 'O': 1}
-        index (str): index slice to control which images are returned, e.g. ':', '::100', etc.
+        index (str, slice, or int): index slice to control which images are returned,
+            e.g. ':', '::100', etc.
 
     Returns:
         traj (list[ase.Atoms]): List of dump images as ase.Atoms objects
@@ -88,7 +96,9 @@ def read_dump(dump, type_map, index=":"):
             )
             atoms.set_tags(types[sort])
             traj.append(atoms)
-    return traj[string2index(index)]
+    if isinstance(index, str):
+        index = string2index(index)
+    return traj[index]
 
 
 def _str_to_float(l):
@@ -192,9 +202,34 @@ def read_db(db_name, indices):
     return traj[string2index(indices)]
 
 
+def stamp_cached(cache, file_name, load):
+    """
+    Get load(path) for file, reusing the result stored in cache while the file's
+    (mtime, size) stamp is unchanged. Outdated entries are replaced (and freed).
+
+    Args:
+        cache (dict): Module level dict to store results in, {abspath: ((mtime, size), result)}.
+        file_name (str): Path to file.
+        load (callable): Function that loads/parses the file given its absolute path.
+
+    Returns:
+        Result of load(path), shared with the cache (copy before modifying).
+    """
+    path = os.path.abspath(file_name)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = cache.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, load(path))
+        cache[path] = cached
+    return cached[1]
+
+
+_graph_type_maps = {} # {abspath: ((mtime, size), type_map)}
 def graph2typemap(graph):
     """
-    Determine type_map for a given deepmd model.
+    Determine type_map for a given deepmd model. Loading the graph is slow, so
+    the type_map is reused while the graph file is unchanged.
 
     Args:
         graph (str): Path to deepmd model .pb file.
@@ -202,10 +237,61 @@ def graph2typemap(graph):
     Returns:
         type_map (dict): Dictionary that maps each atomic symbol to type map index
     """
-    from deepmd import DeepPotential
-    dp = DeepPotential(graph)
-    type_map = {sym: i for i, sym in enumerate(dp.get_type_map())}
-    return type_map
+    def load(path):
+        from deepmd import DeepPotential
+        dp = DeepPotential(path)
+        return {sym: i for i, sym in enumerate(dp.get_type_map())}
+    return dict(stamp_cached(_graph_type_maps, graph, load))
+
+
+_parsed_files = {} # {abspath: ((mtime, size), parsed contents)}
+def read_cached(file_name, loader):
+    """
+    Read and parse file, reusing the previous result if the file has not been
+    modified since it was last read in this process.
+
+    Args:
+        file_name (str): Path to file to read (e.g., in.json or params.yaml).
+        loader (callable): Function that parses the opened file object,
+            e.g. json.load or YAML().load.
+
+    Returns:
+        Copy of parsed file contents (safe to modify).
+    """
+    def load(path):
+        with open(path) as file:
+            return loader(file)
+    return copy.deepcopy(stamp_cached(_parsed_files, file_name, load))
+
+
+def read_json(file_name):
+    """
+    Read .json file, parsing with orjson if installed.
+
+    Args:
+        file_name (str): Path to .json file (e.g., in.json).
+
+    Returns:
+        Parsed file contents (dict).
+    """
+    if orjson is not None:
+        with open(file_name, "rb") as file:
+            return orjson.loads(file.read())
+    with open(file_name) as file:
+        return json.load(file)
+
+
+def write_json(src, file_name):
+    """
+    Write jsonnable object to .json file with 4 space indents. Always uses
+    the json module so the format doesn't depend on optional packages.
+
+    Args:
+        src (dict): jsonnable dictionary (e.g., deepmd-kit training parameters).
+        file_name (str): Path to .json file to write.
+    """
+    with open(file_name, "w") as file:
+        json.dump(src, file, indent=4)
 
 
 def read_type_map(type_map_json):
@@ -214,7 +300,7 @@ def read_type_map(type_map_json):
     elif isinstance(type_map_json, str):
         if type_map_json.endswith(".json"):
             with open(type_map_json) as file:
-                type_map = json.loads(file.read())
+                type_map = json.load(file)
         else:
             type_map = str2typemap(type_map_json)
     else:
@@ -264,7 +350,7 @@ def randomize_seed(in_json):
     """
     if isinstance(in_json, str):
         with open(in_json) as file:
-            in_json = json.loads(file.read())
+            in_json = json.load(file)
     elif not isinstance(in_json, dict):
         raise TypeError("Need dict or .json file to randomize seeds")
     seeds = get_seed(n=3)
@@ -308,7 +394,8 @@ class Converter:
         output (str): Name of file with desired conversion extension specified,
             e.g. ``'out.traj'``
 
-        indices (str): Index slice, e.g. ``'::10'``, :, ``'1:100'``, etc.
+        indices (str, slice, or int): Index slice, e.g. ``'::10'``, :, ``'1:100'``, etc.
+            Already parsed indices (e.g., ``slice(None, None, 10)``) are also accepted.
 
     Example:
 
@@ -0,0 +1,112 @@
+import os
+import sys
+import argparse
+import importlib
+import pytest
+
+from dptools.cli import main, get_command, commands, command_table, help_info
+
+
+def test_get_command():
+    assert get_command(["info", "-m", "water"]) == "info"
+    assert get_command(["--version"]) is None
+    assert get_command(["not_a_command"]) is None
+    assert get_command([]) is None
+
+def test_help_info():
+    assert set(help_info) == set(commands)
+    for comm, mod in command_table.items():
+        assert importlib.import_module(mod).CLI.help_info == help_info[comm]
+
+def test_lazy_import(monkeypatch, capsys):
+    for comm in commands:
+        monkeypatch.delitem(sys.modules, f"dptools.cli.{comm}", raising=False)
+    monkeypatch.setattr(sys, "argv", ["dptools", "info", "--help"])
+    with pytest.raises(SystemExit):
+        main()
+    assert "dptools.cli.info" in sys.modules
+    assert "dptools.cli.input" not in sys.modules
+
+def test_formatter():
+    from dptools.cli import MyFormatter
+    formatter = MyFormatter("dptools")
+    text = """
+    Thing.
+
+    :doc:`Complete documentation here<../commands/info>`
+
+    .. code-block:: console
+
+        $ dptools info
+    """
+    new_text = formatter._fill_text(text, 80, "")
+    assert "Complete documentation here: https://dptools.rtfd.io/en/latest/commands/info.html" in new_text
+    assert "code-block" not in new_text
+    assert "$ dptools info" in new_text
+
+def test_version(monkeypatch, capsys):
+    from dptools import __version__
+    monkeypatch.setattr(sys, "argv", ["dptools", "--version"])
+    main()
+    assert capsys.readouterr().out.strip() == __version__
+
+def test_get_input_paths(tmp_path, monkeypatch):
+    from dptools.cli import get_input_paths
+    monkeypatch.chdir(tmp_path)
+    paths, dirs = get_input_paths(["start.traj"])
+    assert paths == [str(tmp_path / "start.traj")]
+    assert dirs == ["."]
+
+    paths, dirs = get_input_paths(["00/start.traj", "01/start.traj"])
+    assert dirs == [str(tmp_path / "00"), str(tmp_path / "01")]
+    with pytest.raises(Exception):
+        get_input_paths(["00/start.traj", "00/other.traj"])
+
+class MockSimulation:
+    """Stand-in for dptools.simulate.Simulations[...], writes cwd to file_out."""
+    def __init__(self, atoms, graph, type_map=None, file_out=None, path=".", **params):
+        self.file_out = file_out
+
+    def run(self):
+        with open(self.file_out, "w") as file:
+            file.write(os.getcwd())
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_jobs(tmp_path, monkeypatch, jobs):
+    from ase.build import bulk
+    from dptools.simulate import Simulations
+    CLI = importlib.import_module("dptools.cli.run").CLI
+    monkeypatch.setitem(Simulations, "opt", MockSimulation) # forked workers inherit this
+    monkeypatch.chdir(tmp_path)
+    dirs = [str(tmp_path / d) for d in ["00", "01", "02"]]
+    for d in dirs:
+        os.mkdir(d)
+
+    cli = CLI(argparse.ArgumentParser())
+    cli.calc_type, cli.params, cli.file_out = "opt", {}, "opt.traj"
+    cli.graph, cli.type_map = "graph.pb", "Cu:0"
+    cli.atoms, cli.dirs = [bulk("Cu")] * len(dirs), dirs
+    cli.run(jobs=jobs)
+    assert os.getcwd() == str(tmp_path) # cwd restored after running in each dir
+    for d in dirs:
+        with open(os.path.join(d, "opt.traj")) as file:
+            assert file.read() == d
+
+def test_shake_jobs(tmp_path, monkeypatch):
+    import numpy as np
+    from ase.build import bulk
+    from ase.io import read
+    CLI = importlib.import_module("dptools.cli.shake").CLI
+    monkeypatch.chdir(tmp_path)
+    bulk("Cu", cubic=True).write("start.traj")
+    for jobs in [1, 2]:
+        cli = CLI(argparse.ArgumentParser())
+        args = argparse.Namespace(structure="start.traj", n=3, displacement=0.1,
+                path=f"jobs{jobs}", output="start.traj", adsorbate=False, jobs=jobs)
+        np.random.seed(0)
+        cli.main(args)
+    for d in ["000", "001", "002"]:
+        serial = read(os.path.join("jobs1", d, "start.traj"))
+        parallel = read(os.path.join("jobs2", d, "start.traj"))
+        assert np.allclose(serial.positions, parallel.positions) # same seeded displacements
+    assert not np.allclose(serial.positions, read("start.traj").positions)
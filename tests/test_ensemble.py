@@ -0,0 +1,123 @@
+import os
+import numpy as np
+import pytest
+from ase.build import bulk
+from ase.io import write
+
+from dptools.train import ensemble
+from dptools.train.ensemble import max_force_dev, SampleConfigs
+
+type_map = {"Cu": 0}
+
+
+class StubModel:
+    """Stand-in for deepmd DeepPot, records the frames passed to each eval call."""
+    def __init__(self, k):
+        self.k = k
+        self.frames = []
+
+    def eval(self, coord, cell, atype):
+        self.frames.extend(coord)
+        forces = np.sin(coord * self.k).reshape(len(coord), -1, 3)
+        return None, forces, None
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    graphs = {}
+    for k in [1.0, 2.0, 3.0]:
+        graph = tmp_path / f"{k}.pb"
+        graph.write_text("graph")
+        graphs[str(graph)] = StubModel(k)
+    monkeypatch.setattr(ensemble, "_load_model", lambda graph: graphs[graph])
+    return graphs
+
+def get_configs(n):
+    configs = []
+    for i in range(n):
+        atoms = bulk("Cu", cubic=True)
+        atoms.rattle(0.1, seed=i)
+        configs.append(atoms)
+    return configs
+
+
+def test_max_force_dev():
+    rng = np.random.default_rng(0)
+    forces = rng.standard_normal((4, 5, 6, 3))
+    ref = [
+        np.max(np.sqrt(np.mean(np.sum((f - f.mean(axis=0))**2, axis=-1), axis=0)))
+        for f in forces.transpose(1, 0, 2, 3)
+    ]
+    assert np.allclose(max_force_dev(forces), ref)
+
+def test_get_dev_stream(tmp_path, models):
+    configs = get_configs(10)
+    traj = str(tmp_path / "md.traj")
+    write(traj, configs)
+    (tmp_path / "list").mkdir()
+    (tmp_path / "file").mkdir()
+    from_list = SampleConfigs(configs, list(models), type_map, path=str(tmp_path / "list"))
+    from_file = SampleConfigs(traj, list(models), type_map, path=str(tmp_path / "file"))
+    dev = from_list.get_dev(batch_size=3) # batches don't divide evenly on purpose
+    assert len(dev) == 10
+    assert np.allclose(dev, from_file.get_dev(batch_size=3))
+
+    # all configs within tolerance are returned (in order) when n is large enough
+    lo = np.median(dev)
+    i_ref = np.flatnonzero(dev >= lo)
+    new_configs = from_file.sample(lo=lo, hi=np.inf, n=len(configs))
+    assert len(new_configs) == len(i_ref)
+    for i, atoms in zip(i_ref, new_configs):
+        assert np.allclose(atoms.positions, configs[i].positions)
+
+    # otherwise n random configs within tolerance, reproducible with np.random.seed
+    np.random.seed(0)
+    new_configs = from_file.sample(lo=lo, hi=np.inf, n=2)
+    np.random.seed(0)
+    assert new_configs == from_list.sample(lo=lo, hi=np.inf, n=2)
+    chosen = [i for i in i_ref for atoms in new_configs
+              if np.allclose(atoms.positions, configs[i].positions)]
+    assert len(chosen) == 2 and chosen == sorted(chosen)
+
+def test_get_dev_duplicates(tmp_path, models):
+    configs = get_configs(4)
+    # repeated frames (e.g., from restarted MD), within and across batches
+    traj = configs + [configs[3], configs[1], configs[0]] # batches: 0 1 2 | 3 3 1 | 0
+    dev = SampleConfigs(traj, list(models), type_map, path=str(tmp_path)).get_dev(batch_size=3)
+    assert len(dev) == len(traj)
+    for model in models.values():
+        assert len(model.frames) == len(configs) # each unique frame evaluated once
+    assert dev[4] == dev[3] and dev[5] == dev[1] and dev[6] == dev[0]
+    assert len(np.unique(dev)) == len(configs)
+
+def test_get_dev_key(tmp_path, models):
+    traj = str(tmp_path / "md.traj")
+    write(traj, get_configs(6))
+    graphs = list(models)
+    model = models[graphs[0]]
+
+    def get_dev(graphs=graphs, indices=":"):
+        n_frames = len(model.frames)
+        dev = SampleConfigs(traj, graphs, type_map, indices=indices, path=str(tmp_path)).get_dev()
+        return dev, len(model.frames) > n_frames # (dev, recalculated)
+
+    dev, recalculated = get_dev()
+    assert recalculated
+    assert np.allclose(get_dev()[0], dev) and not get_dev()[1] # read from dev.npy
+
+    dev, recalculated = get_dev(indices=":4") # changed indices
+    assert recalculated and len(dev) == 4
+
+    assert get_dev(graphs=graphs[:2])[1] # changed ensemble
+    assert not get_dev(graphs=graphs[:2])[1]
+    with open(graphs[1], "w") as file: # retrained model
+        file.write("new graph")
+    assert get_dev(graphs=graphs[:2])[1]
+
+    write(traj, get_configs(5)) # changed configs
+    dev, recalculated = get_dev(graphs=graphs[:2])
+    assert recalculated and len(dev) == 5
+
+    os.remove(tmp_path / "dev.key") # dev.npy from before dev.key existed
+    assert get_dev(graphs=graphs[:2])[1]
+    assert not get_dev(graphs=graphs[:2])[1]
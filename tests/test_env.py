@@ -0,0 +1,70 @@
+import os
+import pytest
+
+from dptools import env
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    env_file = str(tmp_path / ".env")
+    monkeypatch.setattr(env, "env_file", env_file)
+    monkeypatch.setattr(env, "_env_values", {})
+    return env_file
+
+def test_get_dpfaults_sbatch(env_file):
+    env.set_env("SBATCH_COMMENT", "#SBATCH -N 1")
+    for k in ["OMP_NUM_THREADS",
+              "TF_INTRA_OP_PARALLELISM_THREADS",
+              "TF_INTER_OP_PARALLELISM_THREADS"]:
+        env.set_env(k, "1")
+    hpc_info = env.get_dpfaults(key="sbatch")
+    hpc_info.pop("SBATCH_COMMENT") # like CLI commands do
+    assert env.get_dpfaults(key="sbatch")["SBATCH_COMMENT"] == "#SBATCH -N 1"
+
+    env.set_env("SBATCH_COMMENT", "#SBATCH -N 2")
+    assert env.get_dpfaults(key="sbatch")["SBATCH_COMMENT"] == "#SBATCH -N 2"
+
+def test_get_dpfaults_model(env_file):
+    env.set_env("DPTOOLS_MODEL", "/path/to/graph.pb")
+    env.set_env("DPTOOLS_TYPE_MAP", "Si:0,O:1")
+    assert env.get_dpfaults() == ("/path/to/graph.pb", "Si:0,O:1")
+    env.clear(["DPTOOLS_TYPE_MAP"])
+    assert env.get_dpfaults() == ("/path/to/graph.pb",)
+
+    with open(env_file, "w") as file: # modified outside of dptools
+        file.write("DPTOOLS_MODEL='/path/to/other.pb'\n")
+    os.utime(env_file, ns=(0, 0)) # make sure mtime changes
+    assert env.get_dpfaults() == ("/path/to/other.pb",)
+
+def test_get_env_cache(env_file):
+    assert env.get_env() == {}
+    env.set_env("DPTOOLS_MODEL", "/path/to/graph.pb")
+    values = env.get_env()
+    values["DPTOOLS_MODEL"] = "changed" # modifying result must not modify cached values
+    assert env.get_env() == {"DPTOOLS_MODEL": "/path/to/graph.pb"}
+
+    with open(env_file, "w") as file: # modified outside of dptools
+        file.write("DPTOOLS_MODEL='/path/to/other.pb'\n")
+    os.utime(env_file, ns=(0, 0)) # make sure mtime changes
+    assert env.get_env() == {"DPTOOLS_MODEL": "/path/to/other.pb"}
+
+def test_set_envs(env_file):
+    env.set_env("DPTOOLS_MODEL2", "/path/to/old.pb")
+    env.set_env("OMP_NUM_THREADS", "1")
+    env.set_envs({"SBATCH_COMMENT": "#SBATCH -J 'job' --output=a\\b", "OMP_NUM_THREADS": "4"},
+                 unset=["DPTOOLS_MODEL2"])
+    assert env.get_env() == {"OMP_NUM_THREADS": "4",
+                             "SBATCH_COMMENT": "#SBATCH -J 'job' --output=a\\b"}
+
+def test_set_sbatch(env_file, tmp_path):
+    script = tmp_path / "script.sh"
+    script.write_text("#!/bin/bash\n#SBATCH -N 1\n#SBATCH -t 1:00:00\nexport OMP_NUM_THREADS=2\n")
+    env.set_sbatch(str(script))
+    assert env.get_env() == {"OMP_NUM_THREADS": "2", "SBATCH_COMMENT": "#SBATCH -N 1 -t 1:00:00"}
+
+def test_set_model(env_file, monkeypatch):
+    monkeypatch.setattr(env, "graph2typemap", lambda graph: {"Si": 0, "O": 1})
+    env.set_env("DPTOOLS_MODEL4", "/path/to/old.pb")
+    env.set_model("/path/to/00.pb")
+    env.set_model("/path/to/01.pb", n_model=2)
+    assert env.get_dpfaults(key="ensemble") == ("/path/to/00.pb", "/path/to/01.pb", "Si:0,O:1")
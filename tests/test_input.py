@@ -39,7 +39,7 @@ def test_train_single(tmp_path, dataset, monkeypatch):
     monkeypatch.setattr(cli, 'get_hpc_info', get_mock_hpc)
     train_dir = (tmp_path / 'train')
     args = argparse.Namespace(dataset=dataset, ensemble=False,
-            submit=False, path=train_dir, input=None)
+            submit=False, path=train_dir, input=None, array=False)
 
     cli.main(args)
     assert 'dptools.train.sh' in os.listdir(train_dir)
@@ -50,7 +50,7 @@ def test_train_ensemble(tmp_path, dataset, monkeypatch):
     monkeypatch.setattr(cli, 'get_hpc_info', get_mock_hpc)
     train_dir = (tmp_path / 'train')
     args = argparse.Namespace(dataset=dataset, ensemble=True,
-            submit=False, path=train_dir, input=None)
+            submit=False, path=train_dir, input=None, array=False)
 
     cli.main(args)
     ens_dirs = [os.path.join(train_dir, d) for d in ['00', '01', '02', '03']]
@@ -62,3 +62,24 @@ def test_train_ensemble(tmp_path, dataset, monkeypatch):
         if seed not in seeds:
             raise ValueError("Missing unique values for seeds")
         seeds.append(seed)
+
+def get_mock_hpc_logs():
+    return {'SBATCH_COMMENT': '#SBATCH -N 1 --output=job.out --error=job.err'}
+
+def test_train_array(tmp_path, dataset, monkeypatch):
+    cli = get_cli('train')
+    monkeypatch.setattr(cli, 'get_hpc_info', get_mock_hpc_logs)
+    train_dir = (tmp_path / 'train')
+    args = argparse.Namespace(dataset=dataset, ensemble=True,
+            submit=False, path=train_dir, input=None, array=True)
+
+    cli.main(args)
+    assert 'dptools.train.sh' in os.listdir(train_dir)
+    for d in ['00', '01', '02', '03']:
+        assert 'in.json' in os.listdir(train_dir / d)
+        assert 'dptools.train.sh' not in os.listdir(train_dir / d)
+    with open(train_dir / 'dptools.train.sh') as file:
+        text = file.read()
+    assert 'SLURM_ARRAY_TASK_ID' in text
+    # each array task needs its own log files, not one shared train/job.out
+    assert text.splitlines()[1] == '#SBATCH -N 1 --output=job_%a.out --error=job_%a.err'
@@ -0,0 +1,41 @@
+import os
+import json
+
+from dptools import utils
+from dptools.utils import read_cached, read_json, write_json, stamp_cached
+
+
+def test_read_cached(tmp_path):
+    file_name = tmp_path / "in.json"
+    file_name.write_text(json.dumps({"a": [1, 2]}))
+
+    params = read_cached(str(file_name), json.load)
+    params["a"].append(3) # modifying result must not modify cached contents
+    assert read_cached(str(file_name), json.load) == {"a": [1, 2]}
+
+    file_name.write_text(json.dumps({"b": 1}))
+    os.utime(file_name, ns=(0, 0)) # make sure mtime changes
+    assert read_cached(str(file_name), json.load) == {"b": 1}
+
+
+def test_stamp_cached(tmp_path):
+    file_name = tmp_path / "graph.pb"
+    file_name.write_text("a")
+    cache, loads = {}, []
+    load = lambda path: loads.append(path) or len(loads)
+    assert stamp_cached(cache, str(file_name), load) == 1
+    assert stamp_cached(cache, str(file_name), load) == 1 # unchanged, not reloaded
+    file_name.write_text("ab")
+    assert stamp_cached(cache, str(file_name), load) == 2
+    assert list(cache) == [str(file_name)] # outdated entry replaced
+
+
+def test_read_write_json(tmp_path, monkeypatch):
+    params = {"lr": 3.51e-08, "model": {"type_map": ["O", "H"]}}
+    file_name = str(tmp_path / "in.json")
+    write_json(params, file_name)
+    with open(file_name) as file:
+        assert file.read() == json.dumps(params, indent=4)
+    assert read_json(file_name) == params
+    monkeypatch.setattr(utils, "orjson", None) # stdlib fallback gives same result
+    assert read_json(file_name) == params